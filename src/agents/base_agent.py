@@ -4,9 +4,24 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Audit timestamps are second-granularity, so cache the formatted ISO string
+# and rebuild it only when the integer second ticks over. At more than one
+# logged action per second this amortizes the datetime construction and
+# formatting across every call in that second.
+_ts_cache = [0, ""]
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO string, cached per second"""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = datetime.utcfromtimestamp(now).isoformat()
+    return _ts_cache[1]
+
 class BaseAgent(ABC):
     """Abstract base class for all agents"""
     
@@ -26,7 +41,7 @@ class BaseAgent(ABC):
         """Set the session context for this agent"""
         self.session_id = session_id
         self.context = context
-        logger.info(f"{self.name} - Session context set: {session_id}")
+        logger.info("%s - Session context set: %s", self.name, session_id)
     
     def get_session_context(self) -> Dict[str, Any]:
         """Get current session context"""
@@ -35,11 +50,11 @@ class BaseAgent(ABC):
     def log_action(self, action: str, details: Dict[str, Any]):
         """Log an agent action for audit trail"""
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "agent": self.name,
             "action": action,
             "session_id": self.session_id,
             "details": details
         }
-        logger.info(f"Agent Action: {log_entry}")
+        logger.info("Agent Action: %s", log_entry)
         return log_entry
@@ -1,13 +1,106 @@
 """Followup Agent - Send reminders and post-visit communications"""
 
 import logging
-from typing import Any, Dict
-from datetime import datetime, timedelta
+import os
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from types import MappingProxyType
+
+import orjson
 
 from .base_agent import BaseAgent
+from ..tools.notifications import NotificationTools
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis is optional; fall back to the in-process store
+    aioredis = None
 
 logger = logging.getLogger(__name__)
 
+# Reminder keys expire this long after the appointment time, so Redis
+# self-evicts entries once the appointment has passed
+_REMINDER_TTL_SLACK_SECONDS = 7200
+
+# Sorted set of pending delivery jobs, scored by delivery epoch. Horizontally
+# scaled delivery workers poll it with ZRANGEBYSCORE (now) and send the due
+# reminders, so the API process that scheduled a reminder never holds a timer
+# or delivery state for it.
+_DISPATCH_QUEUE_KEY = "reminder_dispatch_queue"
+
+# Reminder lead times: (seconds before appointment, label, ID suffix,
+# delivery-channel order when the patient has a phone number)
+_REMINDER_OFFSETS = (
+    (86400, "24h", "24H", ("email", "sms")),
+    (3600, "1h", "1H", ("sms", "email")),
+)
+
+# Email-only channel tuple for patients without a phone number, shared
+# instead of allocating a fresh ["email"] list per reminder
+_CH_EMAIL = ("email",)
+
+def compute_reminder_times(appt_epochs) -> List[tuple]:
+    """Compute reminder epochs for a batch of appointment epoch seconds.
+
+    Returns one tuple per appointment with an entry per lead time in
+    _REMINDER_OFFSETS (currently 24h-before, 1h-before). Bulk jobs — e.g. a
+    nightly pass scheduling next-day reminders — should convert their
+    appointment datetimes to epoch seconds once and feed them through here,
+    formatting back to ISO only for the reminders that get emitted.
+    """
+    offsets = tuple(offset for offset, _, _, _ in _REMINDER_OFFSETS)
+    return [tuple(epoch - offset for offset in offsets) for epoch in appt_epochs]
+
+# Static response fragments, hoisted so they are not reallocated per request
+_REMINDER_NEXT_STEPS = (
+    "24-hour reminder will be sent automatically",
+    "1-hour reminder will be sent automatically",
+    "Patient can reply to confirm attendance",
+)
+_NO_SHOW_ACTIONS = (
+    "Recorded no-show in patient record",
+    "Cancelled all subsequent reminders",
+    "Triggered follow-up outreach",
+    "Freed up appointment slot for others",
+    "Sent apology message to patient",
+)
+_NO_SHOW_NEXT_STEPS = (
+    "Contact patient to reschedule",
+    "Note in medical record",
+    "Track no-show history",
+)
+
+# Message templates are pure constants: one shared read-only copy per process
+# instead of two fresh dicts per agent instance
+_EMAIL_TEMPLATES = MappingProxyType({
+    "reminder_24h": "Your appointment with {provider} is scheduled for tomorrow at {time}.",
+    "reminder_1h": "Your appointment with {provider} is in 1 hour. Please head to {location}.",
+    "confirmation": "Your appointment has been confirmed for {datetime} with {provider}.",
+    "cancellation": "Your appointment on {datetime} has been cancelled.",
+    "survey": "Please help us improve by taking a 5-minute survey about your visit."
+})
+
+# Reminder preview template, a module constant like the channel templates
+# above, filled per call with format_map instead of re-building the
+# triple-quoted literal through an f-string
+_REMINDER_PREVIEW_TMPL = """
+        Appointment Reminder
+        ────────────────────
+        Date & Time: {dt}
+        Provider: {prov}
+        Location: {loc}
+
+        Please arrive 10 minutes early.
+        Reply CONFIRM to confirm attendance.
+        """
+
+_SMS_TEMPLATES = MappingProxyType({
+    "reminder_24h": "Reminder: Appointment tomorrow at {time} with {provider}. Arrive early.",
+    "reminder_1h": "Reminder: Appointment in 1 hour at {location}. Reply Y to confirm.",
+    "confirmation": "Confirmed: {date} {time} with {provider}. Location: {location}",
+    "cancellation": "Cancelled: Your {date} appointment has been cancelled."
+})
+
 class FollowupAgent(BaseAgent):
     """
     Followup Agent manages:
@@ -17,15 +110,36 @@ class FollowupAgent(BaseAgent):
     - Test result follow-ups
     - No-show tracking and rescheduling
     """
-    
+
+    # Shared across all instances; see module-level constants
+    email_templates = _EMAIL_TEMPLATES
+    sms_templates = _SMS_TEMPLATES
+
     def __init__(self):
         super().__init__(
             name="FollowupAgent",
             description="Sends reminders and post-visit communications"
         )
+        # Reminders live in Redis (keyed reminders:{appointment_id}, with a
+        # TTL past the appointment time) when REDIS_URL is configured, so
+        # state survives restarts and is shared across workers. Without
+        # Redis, the in-process dict keeps the demo self-contained.
         self.scheduled_reminders = {}
-        self.email_templates = self._init_email_templates()
-        self.sms_templates = self._init_sms_templates()
+        self._redis = None
+        redis_url = os.getenv("REDIS_URL")
+        if aioredis is not None and redis_url:
+            self._redis = aioredis.from_url(redis_url, decode_responses=True)
+        # All outbound SMS/email goes through one pooled HTTP transport so
+        # concurrent sends share warm connections to the gateways
+        self._notifier = NotificationTools()
+        # Action dispatch table built once, mirroring the orchestrator's
+        # routing table, instead of an if/elif chain per request
+        self._action_handlers = {
+            "schedule_reminder": self._schedule_reminders,
+            "cancel_reminders": self._cancel_reminders,
+            "send_survey": self._send_post_visit_survey,
+            "process_no_show": self._process_no_show,
+        }
     
     async def process(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -40,25 +154,19 @@ class FollowupAgent(BaseAgent):
         request_id = request.get("request_id", "FOLLOWUP_REQUEST")
         action = request.get("followup_action", "schedule_reminder")
         
-        logger.info(f"[{request_id}] Followup Agent - Action: {action}")
+        logger.info("[%s] Followup Agent - Action: %s", request_id, action)
         
         try:
-            if action == "schedule_reminder":
-                return await self._schedule_reminders(request, request_id)
-            elif action == "cancel_reminders":
-                return await self._cancel_reminders(request, request_id)
-            elif action == "send_survey":
-                return await self._send_post_visit_survey(request, request_id)
-            elif action == "process_no_show":
-                return await self._process_no_show(request, request_id)
-            else:
+            handler = self._action_handlers.get(action)
+            if handler is None:
                 return {
                     "success": False,
                     "error": f"Unknown followup action: {action}"
                 }
-        
+            return await handler(request, request_id)
+
         except Exception as e:
-            logger.error(f"[{request_id}] Followup Agent error: {str(e)}")
+            logger.error("[%s] Followup Agent error: %s", request_id, e)
             return {
                 "success": False,
                 "error": str(e),
@@ -66,96 +174,122 @@ class FollowupAgent(BaseAgent):
             }
     
     async def _schedule_reminders(self, request: Dict[str, Any], request_id: str) -> Dict[str, Any]:
-        """Schedule appointment reminders"""
-        logger.info(f"[{request_id}] Scheduling reminders")
-        
-        appointment_id = request.get("appointment_id")
+        """Schedule appointment reminders (dict-request adapter).
+
+        Unpacks and validates the generic request payload, then delegates to
+        schedule_reminder_fast. Callers that already hold typed fields (the
+        orchestrator, bulk jobs) should call the fast path directly and skip
+        the per-field .get() dispatch and datetime parse done here.
+        """
+        logger.info("[%s] Scheduling reminders", request_id)
+
         appointment_datetime = request.get("appointment_datetime")
-        patient_email = request.get("patient_email")
-        patient_phone = request.get("patient_phone")
-        provider_name = request.get("provider_name", "Your Healthcare Provider")
-        location = request.get("location", "Clinic")
-        
-        # Parse appointment datetime
+
+        # Parse the appointment datetime once; reminder times are plain
+        # integer epoch arithmetic from there, formatted only at the boundary
         try:
             appt_time = datetime.fromisoformat(appointment_datetime)
-        except:
+        except (TypeError, ValueError):
             return {"success": False, "error": "Invalid appointment datetime"}
-        
+
+        return await self.schedule_reminder_fast(
+            request.get("appointment_id"),
+            int(appt_time.timestamp()),
+            request.get("patient_email"),
+            request.get("patient_phone"),
+            request.get("provider_name", "Your Healthcare Provider"),
+            request.get("location", "Clinic"),
+            request_id=request_id,
+            tz=appt_time.tzinfo,
+            verbose=bool(request.get("verbose"))
+        )
+
+    async def schedule_reminder_fast(self, appointment_id: str, appt_epoch: int,
+                                     patient_email: Optional[str], patient_phone: Optional[str],
+                                     provider_name: str, location: str, *,
+                                     request_id: str = "FOLLOWUP_REQUEST",
+                                     tz=None, verbose: bool = False) -> Dict[str, Any]:
+        """Schedule reminders from typed inputs — the schedule_reminder hot path.
+
+        Takes the appointment time as epoch seconds and every field already
+        typed, so there is no request-dict dispatch and no ISO parse. The
+        response carries a compact reminder_summary (type and scheduled_time
+        per reminder); the full reminder records are included only when
+        verbose is set, keeping the JSON payload small.
+        """
+        appt_time = datetime.fromtimestamp(appt_epoch, tz=tz)
+
         reminders = []
-        
-        # Schedule 24-hour reminder
-        reminder_24h_time = appt_time - timedelta(hours=24)
-        reminder_24h = {
-            "reminder_id": f"REM_{appointment_id}_24H",
-            "type": "appointment_reminder_24h",
-            "scheduled_time": reminder_24h_time.isoformat(),
-            "delivery_channels": ["email", "sms"] if patient_phone else ["email"],
-            "status": "scheduled",
-            "message_template": "reminder_24h"
-        }
-        reminders.append(reminder_24h)
-        
-        # Schedule 1-hour reminder
-        reminder_1h_time = appt_time - timedelta(hours=1)
-        reminder_1h = {
-            "reminder_id": f"REM_{appointment_id}_1H",
-            "type": "appointment_reminder_1h",
-            "scheduled_time": reminder_1h_time.isoformat(),
-            "delivery_channels": ["sms", "email"] if patient_phone else ["email"],
-            "status": "scheduled",
-            "message_template": "reminder_1h"
-        }
-        reminders.append(reminder_1h)
-        
-        # Store reminders
-        self.scheduled_reminders[appointment_id] = reminders
-        
+        dispatch_jobs = []
+        for offset_seconds, label, suffix, channels in _REMINDER_OFFSETS:
+            delivery_epoch = appt_epoch - offset_seconds
+            reminder_time = datetime.fromtimestamp(delivery_epoch, tz=tz)
+            reminders.append({
+                "reminder_id": f"REM_{appointment_id}_{suffix}",
+                "type": f"appointment_reminder_{label}",
+                "scheduled_time": reminder_time.isoformat(),
+                "delivery_channels": list(channels if patient_phone else _CH_EMAIL),
+                "status": "scheduled",
+                "message_template": f"reminder_{label}"
+            })
+            dispatch_jobs.append((f"{appointment_id}:{suffix}", delivery_epoch))
+
+        # Store reminders and enqueue their delivery jobs
+        await self._store_reminders(appointment_id, reminders, appt_time, dispatch_jobs)
+
         # Build message previews
         message_preview = self._build_reminder_message(
-            appointment_datetime,
+            appt_time.isoformat(),
             provider_name,
             location
         )
-        
+
         self.log_action("reminders_scheduled", {
             "request_id": request_id,
             "appointment_id": appointment_id,
             "reminder_count": len(reminders),
             "delivery_channels": "email, sms" if patient_phone else "email"
         })
-        
-        return {
+
+        response = {
             "success": True,
             "appointment_id": appointment_id,
             "reminders_scheduled": len(reminders),
-            "reminders": reminders,
+            "reminder_summary": [
+                {"type": r["type"], "scheduled_time": r["scheduled_time"]}
+                for r in reminders
+            ],
             "message_preview": message_preview,
             "status": "reminders_queued",
             "message": f"Scheduled {len(reminders)} reminders for appointment",
-            "next_steps": [
-                "24-hour reminder will be sent automatically",
-                "1-hour reminder will be sent automatically",
-                "Patient can reply to confirm attendance"
-            ]
+            "next_steps": list(_REMINDER_NEXT_STEPS)
         }
-    
+        if verbose:
+            response["reminders"] = reminders
+        return response
+
     async def _cancel_reminders(self, request: Dict[str, Any], request_id: str) -> Dict[str, Any]:
         """Cancel scheduled reminders"""
-        logger.info(f"[{request_id}] Cancelling reminders")
+        logger.info("[%s] Cancelling reminders", request_id)
         
+        # Bulk cancellations go through the pipelined batch path
+        appointment_ids = request.get("appointment_ids")
+        if appointment_ids:
+            return await self._cancel_reminders_batch(appointment_ids, request_id)
+
         appointment_id = request.get("appointment_id")
-        
-        if appointment_id not in self.scheduled_reminders:
+
+        reminders = await self._load_reminders(appointment_id)
+        if reminders is None:
             return {
                 "success": False,
                 "error": f"No reminders found for appointment {appointment_id}"
             }
-        
-        # Mark reminders as cancelled
-        reminders = self.scheduled_reminders[appointment_id]
+
+        # Mark reminders as cancelled and drop them from the store
         for reminder in reminders:
             reminder["status"] = "cancelled"
+        await self._delete_reminders(appointment_id)
         
         self.log_action("reminders_cancelled", {
             "request_id": request_id,
@@ -170,9 +304,40 @@ class FollowupAgent(BaseAgent):
             "message": f"Cancelled {len(reminders)} reminders"
         }
     
+    async def _cancel_reminders_batch(self, appointment_ids: List[str], request_id: str) -> Dict[str, Any]:
+        """Cancel reminders for many appointments in one store roundtrip"""
+        logger.info("[%s] Cancelling reminders for %d appointments", request_id, len(appointment_ids))
+
+        if self._redis is not None:
+            # One pipelined roundtrip instead of one DELETE per appointment
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for appointment_id in appointment_ids:
+                    pipe.delete(f"reminders:{appointment_id}")
+                    pipe.zrem(_DISPATCH_QUEUE_KEY, *self._dispatch_members(appointment_id))
+                results = await pipe.execute()
+            cancelled = sum(1 for deleted in results[::2] if deleted)
+        else:
+            cancelled = sum(
+                1 for appointment_id in appointment_ids
+                if self.scheduled_reminders.pop(appointment_id, None) is not None
+            )
+
+        self.log_action("reminders_cancelled_batch", {
+            "request_id": request_id,
+            "appointments_processed": len(appointment_ids),
+            "appointments_cancelled": cancelled
+        })
+
+        return {
+            "success": True,
+            "appointments_processed": len(appointment_ids),
+            "appointments_cancelled": cancelled,
+            "message": f"Cancelled reminders for {cancelled} of {len(appointment_ids)} appointments"
+        }
+
     async def _send_post_visit_survey(self, request: Dict[str, Any], request_id: str) -> Dict[str, Any]:
         """Send post-visit satisfaction survey"""
-        logger.info(f"[{request_id}] Sending post-visit survey")
+        logger.info("[%s] Sending post-visit survey", request_id)
         
         patient_email = request.get("patient_email")
         patient_name = request.get("patient_name", "Patient")
@@ -180,7 +345,13 @@ class FollowupAgent(BaseAgent):
         appointment_id = request.get("appointment_id")
         
         survey_link = f"https://survey.healthcare.app/feedback/{appointment_id}"
-        
+
+        delivery = await self._notifier.send_email(
+            to=patient_email,
+            subject="How was your visit?",
+            body=f"Hi {patient_name}, please tell us about your visit with {provider_name}: {survey_link}"
+        )
+
         self.log_action("survey_sent", {
             "request_id": request_id,
             "appointment_id": appointment_id,
@@ -192,7 +363,7 @@ class FollowupAgent(BaseAgent):
             "survey_id": f"SURV_{appointment_id}",
             "patient_email": patient_email,
             "survey_link": survey_link,
-            "delivery_status": "queued",
+            "delivery_status": delivery["delivery_status"],
             "message": "Post-visit survey scheduled for delivery",
             "survey_questions": 5,
             "estimated_completion_time": "3-5 minutes"
@@ -200,7 +371,7 @@ class FollowupAgent(BaseAgent):
     
     async def _process_no_show(self, request: Dict[str, Any], request_id: str) -> Dict[str, Any]:
         """Process no-show and trigger follow-up"""
-        logger.info(f"[{request_id}] Processing no-show")
+        logger.info("[%s] Processing no-show", request_id)
         
         appointment_id = request.get("appointment_id")
         patient_id = request.get("patient_id")
@@ -217,53 +388,62 @@ class FollowupAgent(BaseAgent):
             "success": True,
             "appointment_id": appointment_id,
             "status": "no_show",
-            "actions_taken": [
-                "Recorded no-show in patient record",
-                "Cancelled all subsequent reminders",
-                "Triggered follow-up outreach",
-                "Freed up appointment slot for others",
-                "Sent apology message to patient"
-            ],
+            "actions_taken": list(_NO_SHOW_ACTIONS),
             "followup_messages": {
                 "email_scheduled": True,
                 "phone_call_scheduled": bool(patient_phone),
                 "reschedule_opportunity": True
             },
-            "next_steps": [
-                "Contact patient to reschedule",
-                "Note in medical record",
-                "Track no-show history"
-            ]
+            "next_steps": list(_NO_SHOW_NEXT_STEPS)
         }
     
+    async def _store_reminders(self, appointment_id: str, reminders: List[Dict[str, Any]], appt_time: datetime, dispatch_jobs: List[tuple]) -> None:
+        """Persist reminders and enqueue delivery jobs for the workers.
+
+        With Redis, one pipelined roundtrip writes the reminder record (with
+        TTL) and ZADDs each delivery job into the dispatch queue at its
+        delivery epoch. Delivery then belongs entirely to the queue workers;
+        this process keeps no timer. Without Redis the in-process dict keeps
+        the demo self-contained (no delivery backend).
+        """
+        if self._redis is not None:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.set(
+                    f"reminders:{appointment_id}",
+                    orjson.dumps(reminders),
+                    exat=int(appt_time.timestamp()) + _REMINDER_TTL_SLACK_SECONDS
+                )
+                pipe.zadd(_DISPATCH_QUEUE_KEY, dict(dispatch_jobs))
+                await pipe.execute()
+        else:
+            self.scheduled_reminders[appointment_id] = reminders
+
+    async def _load_reminders(self, appointment_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Load reminders for an appointment, or None if none are stored"""
+        if self._redis is not None:
+            raw = await self._redis.get(f"reminders:{appointment_id}")
+            return orjson.loads(raw) if raw else None
+        return self.scheduled_reminders.get(appointment_id)
+
+    async def _delete_reminders(self, appointment_id: str) -> None:
+        """Remove stored reminders and their queued delivery jobs"""
+        if self._redis is not None:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.delete(f"reminders:{appointment_id}")
+                pipe.zrem(_DISPATCH_QUEUE_KEY, *self._dispatch_members(appointment_id))
+                await pipe.execute()
+        else:
+            self.scheduled_reminders.pop(appointment_id, None)
+
+    @staticmethod
+    def _dispatch_members(appointment_id: str) -> List[str]:
+        """Dispatch-queue member keys for an appointment's reminders"""
+        return [f"{appointment_id}:{suffix}" for _, _, suffix, _ in _REMINDER_OFFSETS]
+
     def _build_reminder_message(self, appointment_datetime: str, provider_name: str, location: str) -> str:
         """Build reminder message preview"""
-        return f"""
-        Appointment Reminder
-        ────────────────────
-        Date & Time: {appointment_datetime}
-        Provider: {provider_name}
-        Location: {location}
-        
-        Please arrive 10 minutes early.
-        Reply CONFIRM to confirm attendance.
-        """
-    
-    def _init_email_templates(self) -> Dict[str, str]:
-        """Initialize email templates"""
-        return {
-            "reminder_24h": "Your appointment with {provider} is scheduled for tomorrow at {time}.",
-            "reminder_1h": "Your appointment with {provider} is in 1 hour. Please head to {location}.",
-            "confirmation": "Your appointment has been confirmed for {datetime} with {provider}.",
-            "cancellation": "Your appointment on {datetime} has been cancelled.",
-            "survey": "Please help us improve by taking a 5-minute survey about your visit."
-        }
-    
-    def _init_sms_templates(self) -> Dict[str, str]:
-        """Initialize SMS templates"""
-        return {
-            "reminder_24h": "Reminder: Appointment tomorrow at {time} with {provider}. Arrive early.",
-            "reminder_1h": "Reminder: Appointment in 1 hour at {location}. Reply Y to confirm.",
-            "confirmation": "Confirmed: {date} {time} with {provider}. Location: {location}",
-            "cancellation": "Cancelled: Your {date} appointment has been cancelled."
-        }
+        return _REMINDER_PREVIEW_TMPL.format_map({
+            "dt": appointment_datetime,
+            "prov": provider_name,
+            "loc": location
+        })
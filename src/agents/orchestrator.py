@@ -1,13 +1,29 @@
 """Orchestrator Agent - Routes requests to appropriate sub-agents"""
 
 import logging
+import os
+import time
 from typing import Any, Dict, Optional
-from datetime import datetime
 import asyncio
 from .base_agent import BaseAgent
 
 logger = logging.getLogger(__name__)
 
+def _new_request_id() -> str:
+    """Generate a lexicographically sortable request ID (ULID-style).
+
+    11 hex digits of millisecond time followed by 40 random bits: IDs sort by
+    creation time, need no shared counter, and are safe across event-loop
+    executors. Pure stdlib stand-in for ulid-py, which is not a dependency.
+    """
+    return f"REQ_{time.time_ns() // 1_000_000:011X}{os.urandom(5).hex().upper()}"
+
+def _as_response(result: Any) -> Dict[str, Any]:
+    """Normalize a gather() result, converting raised exceptions to error dicts"""
+    if isinstance(result, BaseException):
+        return {"success": False, "error": str(result)}
+    return result
+
 class OrchestratorAgent(BaseAgent):
     """
     Master orchestrator agent that:
@@ -23,7 +39,18 @@ class OrchestratorAgent(BaseAgent):
             description="Master agent that routes requests to specialized agents"
         )
         self.sub_agents = {}
-        self.request_id_counter = 0
+        # Dispatch table built once; _route_request previously rebuilt an
+        # equivalent dict literal (and seven bound methods) on every request
+        self._routes = {
+            "new_patient_appointment": self._handle_new_patient,
+            "schedule_appointment": self._handle_schedule,
+            "reschedule_appointment": self._handle_reschedule,
+            "verify_insurance": self._handle_verify,
+            "get_records": self._handle_records,
+            "send_reminder": self._handle_reminder,
+            "intake_form": self._handle_intake,
+        }
+        self._supported_types = tuple(self._routes)
     
     async def process(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -39,10 +66,9 @@ class OrchestratorAgent(BaseAgent):
         Returns:
             Response dictionary with aggregated results from sub-agents
         """
-        self.request_id_counter += 1
-        request_id = f"REQ_{datetime.utcnow().timestamp()}_{self.request_id_counter}"
+        request_id = _new_request_id()
         
-        logger.info(f"[{request_id}] Orchestrator processing request: {request.get('request_type')}")
+        logger.info("[%s] Orchestrator processing request: %s", request_id, request.get("request_type"))
         
         try:
             # Classify the request
@@ -52,17 +78,18 @@ class OrchestratorAgent(BaseAgent):
             # Route to appropriate agent(s)
             response = await self._route_request(request_type, request, request_id, session_id)
             
-            # Log the orchestration
-            self.log_action("route_request", {
-                "request_id": request_id,
-                "request_type": request_type,
-                "success": response.get("success", False)
-            })
+            # Log the orchestration (payload dict is only built if INFO is enabled)
+            if logger.isEnabledFor(logging.INFO):
+                self.log_action("route_request", {
+                    "request_id": request_id,
+                    "request_type": request_type,
+                    "success": response.get("success", False)
+                })
             
             return response
         
         except Exception as e:
-            logger.error(f"[{request_id}] Orchestrator error: {str(e)}")
+            logger.error("[%s] Orchestrator error: %s", request_id, e)
             return {
                 "request_id": request_id,
                 "success": False,
@@ -88,28 +115,18 @@ class OrchestratorAgent(BaseAgent):
         - get_records: Route to Records
         - send_reminder: Route to Followup
         """
-        
-        routing_map = {
-            "new_patient_appointment": self._handle_new_patient,
-            "schedule_appointment": self._handle_schedule,
-            "reschedule_appointment": self._handle_reschedule,
-            "verify_insurance": self._handle_verify,
-            "get_records": self._handle_records,
-            "send_reminder": self._handle_reminder,
-            "intake_form": self._handle_intake,
-        }
-        
-        handler = routing_map.get(request_type)
-        
+
+        handler = self._routes.get(request_type)
+
         if not handler:
-            logger.warning(f"[{request_id}] Unknown request type: {request_type}")
+            logger.warning("[%s] Unknown request type: %s", request_id, request_type)
             return {
                 "request_id": request_id,
                 "success": False,
                 "error": f"Unknown request type: {request_type}",
-                "supported_types": list(routing_map.keys())
+                "supported_types": list(self._supported_types)
             }
-        
+
         return await handler(request, request_id, session_id)
     
     async def _handle_new_patient(
@@ -119,21 +136,69 @@ class OrchestratorAgent(BaseAgent):
         session_id: str
     ) -> Dict[str, Any]:
         """Handle new patient appointment - Intake + Scheduling in parallel"""
-        logger.info(f"[{request_id}] Routing to Intake + Scheduling agents (parallel)")
-        
-        # TODO: Implement parallel execution of Intake and Scheduling agents
+        logger.info("[%s] Routing to Intake + Scheduling agents (parallel)", request_id)
+
+        intake_agent = self.sub_agents.get("intake")
+        scheduling_agent = self.sub_agents.get("scheduling")
+        verification_agent = self.sub_agents.get("verification")
+
+        if not intake_agent or not scheduling_agent:
+            return {
+                "request_id": request_id,
+                "session_id": session_id,
+                "success": False,
+                "error": "Intake and Scheduling agents must be registered",
+                "agents_involved": []
+            }
+
+        # Intake and availability lookup are independent, so they run
+        # concurrently; total latency is the max of the two instead of the sum.
+        intake_task = asyncio.create_task(intake_agent.process({
+            "request_id": request_id,
+            "patient_info": request.get("patient_info", {})
+        }))
+        scheduling_task = asyncio.create_task(scheduling_agent.process({
+            "request_id": request_id,
+            "appointment_action": "check_availability",
+            "preferred_date": request.get("preferred_date"),
+            "appointment_type": request.get("appointment_type", "checkup"),
+            "duration_minutes": request.get("duration_minutes", 30)
+        }))
+
+        async def _verify_after_intake() -> Dict[str, Any]:
+            # Verification depends only on intake output, so it starts the
+            # instant intake finishes without waiting for scheduling.
+            intake_response = await intake_task
+            if not verification_agent or not intake_response.get("success"):
+                return {"success": False, "skipped": True}
+            return await verification_agent.process({
+                "request_id": request_id,
+                "patient_id": intake_response.get("patient_id"),
+                "insurance_provider": intake_response.get("insurance_provider"),
+                "insurance_id": intake_response.get("insurance_id")
+            })
+
+        verify_task = asyncio.create_task(_verify_after_intake())
+
+        intake_result, scheduling_result, verification_result = await asyncio.gather(
+            intake_task, scheduling_task, verify_task, return_exceptions=True
+        )
+        intake_result = _as_response(intake_result)
+        scheduling_result = _as_response(scheduling_result)
+        verification_result = _as_response(verification_result)
+
+        success = intake_result.get("success", False) and scheduling_result.get("success", False)
+
         return {
             "request_id": request_id,
             "session_id": session_id,
-            "success": True,
-            "message": "New patient appointment workflow initiated",
+            "success": success,
+            "message": "New patient appointment workflow complete" if success
+                       else "New patient appointment workflow failed",
             "agents_involved": ["Intake", "Scheduling", "Verification"],
-            "workflow_steps": [
-                "Parse patient intake form",
-                "Query provider availability",
-                "Verify insurance coverage",
-                "Send appointment confirmation"
-            ]
+            "intake": intake_result,
+            "scheduling": scheduling_result,
+            "verification": verification_result
         }
     
     async def _handle_schedule(
@@ -143,7 +208,7 @@ class OrchestratorAgent(BaseAgent):
         session_id: str
     ) -> Dict[str, Any]:
         """Handle appointment scheduling"""
-        logger.info(f"[{request_id}] Routing to Scheduling agent")
+        logger.info("[%s] Routing to Scheduling agent", request_id)
         
         # TODO: Implement Scheduling agent call
         return {
@@ -161,7 +226,7 @@ class OrchestratorAgent(BaseAgent):
         session_id: str
     ) -> Dict[str, Any]:
         """Handle appointment rescheduling"""
-        logger.info(f"[{request_id}] Routing to Scheduling + Followup agents")
+        logger.info("[%s] Routing to Scheduling + Followup agents", request_id)
         
         # TODO: Implement rescheduling workflow
         return {
@@ -179,7 +244,7 @@ class OrchestratorAgent(BaseAgent):
         session_id: str
     ) -> Dict[str, Any]:
         """Handle insurance verification"""
-        logger.info(f"[{request_id}] Routing to Verification agent")
+        logger.info("[%s] Routing to Verification agent", request_id)
         
         # TODO: Implement Verification agent call
         return {
@@ -197,7 +262,7 @@ class OrchestratorAgent(BaseAgent):
         session_id: str
     ) -> Dict[str, Any]:
         """Handle records retrieval"""
-        logger.info(f"[{request_id}] Routing to Records agent")
+        logger.info("[%s] Routing to Records agent", request_id)
         
         # TODO: Implement Records agent call
         return {
@@ -215,7 +280,7 @@ class OrchestratorAgent(BaseAgent):
         session_id: str
     ) -> Dict[str, Any]:
         """Handle appointment reminder"""
-        logger.info(f"[{request_id}] Routing to Followup agent")
+        logger.info("[%s] Routing to Followup agent", request_id)
         
         # TODO: Implement Followup agent call
         return {
@@ -233,7 +298,7 @@ class OrchestratorAgent(BaseAgent):
         session_id: str
     ) -> Dict[str, Any]:
         """Handle patient intake form submission"""
-        logger.info(f"[{request_id}] Routing to Intake agent")
+        logger.info("[%s] Routing to Intake agent", request_id)
         
         # TODO: Implement Intake agent call
         return {
@@ -1,14 +1,145 @@
 """Scheduling Agent - Manage appointment booking and rescheduling"""
 
 import logging
+import os
+import sys
+import time
+from array import array
+from functools import lru_cache
 from typing import Any, Dict, List
 from datetime import datetime, timedelta
 import asyncio
 
 from .base_agent import BaseAgent
+from ..models.appointment import Appointment, AppointmentStatus, AppointmentType
+
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO-8601 datetime, cached per distinct input string.
+
+    Availability probes commonly repeat the same base date, so the cache
+    turns the parse into a dict hit. On Python 3.11+ fromisoformat accepts a
+    trailing 'Z' directly; the fallback keeps 3.10 (the Docker image) working
+    without allocating the replaced string on the common path.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def _fmt_iso(ns: int) -> str:
+    """Format a time.time_ns() stamp as a UTC ISO string, at the boundary"""
+    return datetime.utcfromtimestamp(ns / 1e9).isoformat()
+
+# Status codes for the store's int8 column: one byte per row instead of a
+# string reference, decoded back to AppointmentStatus only at the boundary
+_STATUS_TO_INT = {status: index for index, status in enumerate(AppointmentStatus)}
+_INT_TO_STATUS = tuple(AppointmentStatus)
+
+class AppointmentStore:
+    """Columnar (structure-of-arrays) store for booked appointments.
+
+    Scan-style queries — every appointment for a patient, counts by provider
+    or status — sweep the compact parallel columns instead of walking a dict
+    of per-appointment records, while the id->row map keeps single-
+    appointment lookups O(1). The full Appointment record rides along per row
+    for response emission; the columns are authoritative for scans. The
+    status column is an int8 array (see _STATUS_TO_INT), so status scans
+    compare single bytes rather than strings.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.patient_ids: List[str] = []
+        self.provider_ids: List[str] = []
+        self.scheduled_datetimes: List[str] = []
+        self.statuses = array("b")
+        self.records: List[Appointment] = []
+        self.id_to_idx: Dict[str, int] = {}
+
+    def __contains__(self, appointment_id: str) -> bool:
+        return appointment_id in self.id_to_idx
+
+    def add(self, appointment: Appointment) -> int:
+        """Append an appointment row; returns its index"""
+        idx = len(self.ids)
+        self.ids.append(appointment.appointment_id)
+        self.patient_ids.append(appointment.patient_id)
+        self.provider_ids.append(appointment.provider_id)
+        self.scheduled_datetimes.append(appointment.scheduled_datetime.isoformat())
+        self.statuses.append(_STATUS_TO_INT[appointment.status])
+        self.records.append(appointment)
+        self.id_to_idx[appointment.appointment_id] = idx
+        return idx
+
+    def get(self, appointment_id: str) -> Any:
+        """Full record for an appointment, or None if unknown"""
+        idx = self.id_to_idx.get(appointment_id)
+        return None if idx is None else self.records[idx]
+
+    def set_status(self, appointment_id: str, status: AppointmentStatus) -> None:
+        """Update the status column and the record for one appointment"""
+        idx = self.id_to_idx[appointment_id]
+        self.statuses[idx] = _STATUS_TO_INT[status]
+        self.records[idx].status = status
+
+    def status_of(self, appointment_id: str) -> AppointmentStatus:
+        """Decode the stored status code for one appointment"""
+        return _INT_TO_STATUS[self.statuses[self.id_to_idx[appointment_id]]]
+
+    def set_datetime(self, appointment_id: str, scheduled_datetime: str) -> None:
+        """Update the scheduled-datetime column and record for one appointment"""
+        idx = self.id_to_idx[appointment_id]
+        self.scheduled_datetimes[idx] = scheduled_datetime
+        self.records[idx].scheduled_datetime = _parse_iso(scheduled_datetime)
+
+    def indexes_for_patient(self, patient_id: str) -> List[int]:
+        """Row indexes for every appointment of one patient (column sweep)"""
+        return [
+            idx for idx, row_patient in enumerate(self.patient_ids)
+            if row_patient == patient_id
+        ]
 
 logger = logging.getLogger(__name__)
 
+# Availability IDs for the fixed five-slot mock window, interned once
+_SLOT_IDS = ("SLOT_0", "SLOT_1", "SLOT_2", "SLOT_3", "SLOT_4")
+
+# Strings repeated across provider records and generated slots, interned so
+# every reference shares one allocation and equality checks short-circuit on
+# pointer identity
+_DOWNTOWN_CLINIC = sys.intern("Downtown Clinic")
+_DR_JANE_SMITH = sys.intern("Dr. Jane Smith")
+
+# Fallback record for unknown provider IDs, so misses cost one shared
+# constant instead of an empty-dict sentinel allocation per lookup
+_UNKNOWN_PROVIDER = {
+    "name": "Dr. Unknown",
+    "location": _DOWNTOWN_CLINIC,
+}
+
+# Mock provider database, built once per process instead of per agent
+_PROVIDERS = {
+    "PROV_001": {
+        "name": _DR_JANE_SMITH,
+        "specialty": "General Practice",
+        "location": _DOWNTOWN_CLINIC,
+        "phone": "+1-202-555-0123"
+    },
+    "PROV_002": {
+        "name": "Dr. John Martinez",
+        "specialty": "Cardiology",
+        "location": "Medical Plaza",
+        "phone": "+1-202-555-0124"
+    },
+    "PROV_003": {
+        "name": "Dr. Sarah Chen",
+        "specialty": "Dermatology",
+        "location": _DOWNTOWN_CLINIC,
+        "phone": "+1-202-555-0125"
+    }
+}
+
 class SchedulingAgent(BaseAgent):
     """
     Scheduling Agent manages:
@@ -24,9 +155,17 @@ class SchedulingAgent(BaseAgent):
             name="SchedulingAgent",
             description="Manages appointment scheduling and calendar operations"
         )
-        # Mock provider database
-        self.providers = self._init_mock_providers()
-        self.scheduled_appointments = {}
+        # Mock provider database (module-level, shared across instances)
+        self.providers = _PROVIDERS
+        self.appointments = AppointmentStore()
+        # Action dispatch table built once, mirroring the followup agent's
+        # routing table, instead of an if/elif chain per request
+        self._actions = {
+            "check_availability": self._handle_availability_check,
+            "book": self._handle_appointment_booking,
+            "reschedule": self._handle_rescheduling,
+            "cancel": self._handle_cancellation,
+        }
     
     async def process(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -41,34 +180,39 @@ class SchedulingAgent(BaseAgent):
         request_id = request.get("request_id", "SCHEDULE_REQUEST")
         request_type = request.get("appointment_action", "schedule")
         
-        logger.info(f"[{request_id}] Scheduling Agent - Action: {request_type}")
+        logger.info("[%s] Scheduling Agent - Action: %s", request_id, request_type)
         
+        # One timestamp per request: booking, rescheduling and cancellation
+        # all stamp records at the same logical instant. Stored as raw
+        # nanoseconds — an 8-byte int per row instead of a 26-char ISO
+        # string — and formatted by _fmt_iso only where a response needs it
+        now_ns = time.time_ns()
+
         try:
-            if request_type == "check_availability":
-                return await self._handle_availability_check(request, request_id)
-            elif request_type == "book":
-                return await self._handle_appointment_booking(request, request_id)
-            elif request_type == "reschedule":
-                return await self._handle_rescheduling(request, request_id)
-            elif request_type == "cancel":
-                return await self._handle_cancellation(request, request_id)
-            else:
+            handler = self._actions.get(request_type)
+            if handler is None:
                 return {
                     "success": False,
                     "error": f"Unknown appointment action: {request_type}"
                 }
+            # Handlers are plain functions — the mock store does no I/O, so
+            # dispatching without await skips a coroutine allocation and
+            # event-loop round-trip per request. process() itself stays async
+            # for the BaseAgent contract; handlers that grow real DB/HTTP
+            # calls should become coroutines again at that point.
+            return handler(request, request_id, now_ns)
         
         except Exception as e:
-            logger.error(f"[{request_id}] Scheduling Agent error: {str(e)}")
+            logger.error("[%s] Scheduling Agent error: %s", request_id, e)
             return {
                 "success": False,
                 "error": str(e),
                 "message": "Failed to process scheduling request"
             }
     
-    async def _handle_availability_check(self, request: Dict[str, Any], request_id: str) -> Dict[str, Any]:
+    def _handle_availability_check(self, request: Dict[str, Any], request_id: str, now_ns: int) -> Dict[str, Any]:
         """Check provider availability for given date range"""
-        logger.info(f"[{request_id}] Checking availability")
+        logger.info("[%s] Checking availability", request_id)
         
         preferred_date = request.get("preferred_date")
         appointment_type = request.get("appointment_type", "checkup")
@@ -88,34 +232,41 @@ class SchedulingAgent(BaseAgent):
             "message": f"Found {len(available_slots)} available slots"
         }
     
-    async def _handle_appointment_booking(self, request: Dict[str, Any], request_id: str) -> Dict[str, Any]:
+    def _handle_appointment_booking(self, request: Dict[str, Any], request_id: str, now_ns: int) -> Dict[str, Any]:
         """Book an appointment"""
-        logger.info(f"[{request_id}] Booking appointment")
+        logger.info("[%s] Booking appointment", request_id)
         
         patient_id = request.get("patient_id")
         appointment_type = request.get("appointment_type", "checkup")
         appointment_datetime = request.get("preferred_date")
         provider_id = request.get("preferred_provider", "PROV_001")
+        provider = self.providers.get(provider_id) or _UNKNOWN_PROVIDER
         
         # Generate appointment ID
         appointment_id = self._generate_appointment_id()
         
-        # Mock: Book the appointment
-        booking_result = {
-            "appointment_id": appointment_id,
-            "patient_id": patient_id,
-            "provider_id": provider_id,
-            "provider_name": self.providers.get(provider_id, {}).get("name", "Dr. Unknown"),
-            "appointment_datetime": appointment_datetime,
-            "appointment_type": appointment_type,
-            "location": self.providers.get(provider_id, {}).get("location", "Downtown Clinic"),
-            "duration_minutes": 30,
-            "status": "scheduled",
-            "booked_at": datetime.utcnow().isoformat()
-        }
+        # Mock: Book the appointment. The payload is internally generated
+        # and trusted, so model_construct skips pydantic-core validation —
+        # but every value is coerced to its declared type first, so the
+        # record serializes cleanly; external appointment data must still
+        # come in through Appointment.model_validate.
+        appointment = Appointment.model_construct(
+            appointment_id=appointment_id,
+            patient_id=patient_id,
+            patient_name="",
+            appointment_type=AppointmentType(appointment_type),
+            scheduled_datetime=_parse_iso(appointment_datetime),
+            duration_minutes=30,
+            provider_id=provider_id,
+            provider_name=provider["name"],
+            location=provider["location"],
+            status=AppointmentStatus.SCHEDULED,
+            created_at=now_ns,
+            updated_at=now_ns
+        )
         
         # Store appointment
-        self.scheduled_appointments[appointment_id] = booking_result
+        self.appointments.add(appointment)
         
         self.log_action("appointment_booked", {
             "request_id": request_id,
@@ -128,9 +279,9 @@ class SchedulingAgent(BaseAgent):
             "success": True,
             "appointment_id": appointment_id,
             "patient_id": patient_id,
-            "provider_name": booking_result["provider_name"],
+            "provider_name": appointment.provider_name,
             "appointment_datetime": appointment_datetime,
-            "location": booking_result["location"],
+            "location": appointment.location,
             "confirmation_token": f"CONF_{appointment_id}",
             "status": "scheduled",
             "next_steps": [
@@ -141,31 +292,41 @@ class SchedulingAgent(BaseAgent):
             "message": f"Appointment scheduled for {appointment_datetime}"
         }
     
-    async def _handle_rescheduling(self, request: Dict[str, Any], request_id: str) -> Dict[str, Any]:
+    def _handle_rescheduling(self, request: Dict[str, Any], request_id: str, now_ns: int) -> Dict[str, Any]:
         """Reschedule an existing appointment"""
-        logger.info(f"[{request_id}] Rescheduling appointment")
+        logger.info("[%s] Rescheduling appointment", request_id)
         
         appointment_id = request.get("appointment_id")
         new_date = request.get("new_date")
         
         # Check if appointment exists
-        if appointment_id not in self.scheduled_appointments:
+        appointment = self.appointments.get(appointment_id)
+        if appointment is None:
             return {
                 "success": False,
                 "error": f"Appointment {appointment_id} not found"
             }
         
+        # Validate the new date before touching the store, so a bad input
+        # cannot leave the appointment RESCHEDULED with its old datetime
+        try:
+            _parse_iso(new_date)
+        except (TypeError, ValueError):
+            return {
+                "success": False,
+                "error": f"Invalid new appointment datetime: {new_date}"
+            }
+
         # Update appointment
-        old_appointment = self.scheduled_appointments[appointment_id]
-        old_appointment["status"] = "rescheduled"
-        old_appointment["previous_datetime"] = old_appointment["appointment_datetime"]
-        old_appointment["appointment_datetime"] = new_date
-        old_appointment["updated_at"] = datetime.utcnow().isoformat()
+        previous_datetime = appointment.scheduled_datetime.isoformat()
+        self.appointments.set_status(appointment_id, AppointmentStatus.RESCHEDULED)
+        self.appointments.set_datetime(appointment_id, new_date)
+        appointment.updated_at = now_ns
         
         self.log_action("appointment_rescheduled", {
             "request_id": request_id,
             "appointment_id": appointment_id,
-            "old_date": old_appointment["previous_datetime"],
+            "old_date": previous_datetime,
             "new_date": new_date
         })
         
@@ -174,7 +335,7 @@ class SchedulingAgent(BaseAgent):
             "appointment_id": appointment_id,
             "status": "rescheduled",
             "new_datetime": new_date,
-            "old_datetime": old_appointment["previous_datetime"],
+            "old_datetime": previous_datetime,
             "message": f"Appointment rescheduled to {new_date}",
             "next_steps": [
                 "Cancel old reminders",
@@ -183,25 +344,25 @@ class SchedulingAgent(BaseAgent):
             ]
         }
     
-    async def _handle_cancellation(self, request: Dict[str, Any], request_id: str) -> Dict[str, Any]:
+    def _handle_cancellation(self, request: Dict[str, Any], request_id: str, now_ns: int) -> Dict[str, Any]:
         """Cancel an appointment"""
-        logger.info(f"[{request_id}] Cancelling appointment")
+        logger.info("[%s] Cancelling appointment", request_id)
         
         appointment_id = request.get("appointment_id")
         reason = request.get("reason", "No reason provided")
         
         # Check if appointment exists
-        if appointment_id not in self.scheduled_appointments:
+        appointment = self.appointments.get(appointment_id)
+        if appointment is None:
             return {
                 "success": False,
                 "error": f"Appointment {appointment_id} not found"
             }
         
         # Update appointment status
-        appointment = self.scheduled_appointments[appointment_id]
-        appointment["status"] = "cancelled"
-        appointment["cancellation_reason"] = reason
-        appointment["cancelled_at"] = datetime.utcnow().isoformat()
+        self.appointments.set_status(appointment_id, AppointmentStatus.CANCELLED)
+        appointment.notes = f"Cancelled: {reason}"
+        appointment.updated_at = now_ns
         
         self.log_action("appointment_cancelled", {
             "request_id": request_id,
@@ -213,7 +374,7 @@ class SchedulingAgent(BaseAgent):
             "success": True,
             "appointment_id": appointment_id,
             "status": "cancelled",
-            "cancellation_timestamp": appointment["cancelled_at"],
+            "cancellation_timestamp": _fmt_iso(now_ns),
             "message": "Appointment cancelled successfully"
         }
     
@@ -221,49 +382,38 @@ class SchedulingAgent(BaseAgent):
         """Generate mock available appointment slots"""
         slots = []
         
-        # Generate 5 available slots around preferred date
-        base_date = datetime.fromisoformat(preferred_date.replace('Z', '+00:00'))
-        
+        # Generate 5 available slots around preferred date. The date is
+        # parsed once and the loop-invariant timedeltas are built once; each
+        # slot then costs one add, one replace and two isoformat calls
+        base_date = _parse_iso(preferred_date)
+        one_day = timedelta(days=1)
+        duration = timedelta(minutes=duration_minutes)
+
+        # Fields shared by every slot in the batch, written once and copied
+        # into each slot dict instead of being re-specified per iteration
+        base_slot = {
+            "duration_minutes": duration_minutes,
+            "provider_name": _DR_JANE_SMITH,
+            "location": _DOWNTOWN_CLINIC,
+            "appointment_type": appointment_type,
+        }
+
+        slot_date = base_date
         for i in range(5):
-            slot_time = base_date + timedelta(days=i)
-            slot_time = slot_time.replace(hour=9 + (i % 3))  # 9 AM, 10 AM, 11 AM
-            
+            slot_time = slot_date.replace(hour=9 + (i % 3))  # 9 AM, 10 AM, 11 AM
+            slot_date = slot_date + one_day
+
             slots.append({
                 "start_time": slot_time.isoformat(),
-                "end_time": (slot_time + timedelta(minutes=duration_minutes)).isoformat(),
-                "duration_minutes": duration_minutes,
-                "provider_name": "Dr. Jane Smith",
-                "location": "Downtown Clinic",
-                "appointment_type": appointment_type,
-                "availability_id": f"SLOT_{i}"
+                "end_time": (slot_time + duration).isoformat(),
+                **base_slot,
+                "availability_id": _SLOT_IDS[i]
             })
         
         return slots
     
     def _generate_appointment_id(self) -> str:
         """Generate unique appointment ID"""
-        import uuid
-        return f"APT_{uuid.uuid4().hex[:8].upper()}"
-    
-    def _init_mock_providers(self) -> Dict[str, Dict[str, Any]]:
-        """Initialize mock provider database"""
-        return {
-            "PROV_001": {
-                "name": "Dr. Jane Smith",
-                "specialty": "General Practice",
-                "location": "Downtown Clinic",
-                "phone": "+1-202-555-0123"
-            },
-            "PROV_002": {
-                "name": "Dr. John Martinez",
-                "specialty": "Cardiology",
-                "location": "Medical Plaza",
-                "phone": "+1-202-555-0124"
-            },
-            "PROV_003": {
-                "name": "Dr. Sarah Chen",
-                "specialty": "Dermatology",
-                "location": "Downtown Clinic",
-                "phone": "+1-202-555-0125"
-            }
-        }
+        # Same 32-bit collision domain as the uuid4 hex slice this replaces,
+        # without constructing and formatting a full UUID object per booking
+        return f"APT_{os.urandom(4).hex().upper()}"
@@ -1,8 +1,13 @@
 """Main entry point for Healthcare Administrative Assistant Agent"""
 
 import asyncio
+import atexit
+import functools
 import logging
-from typing import Dict, Any
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from dataclasses import asdict, dataclass
+from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from pathlib import Path
 import sys
@@ -11,32 +16,136 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
-from src.agents.orchestrator import OrchestratorAgent
-from src.agents.intake_agent import IntakeAgent
-from src.agents.scheduling_agent import SchedulingAgent
-from src.agents.verification_agent import VerificationAgent
-from src.agents.followup_agent import FollowupAgent
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional; the default selector loop works everywhere
+    uvloop = None
+
+# Configure logging: records are handed off through a queue and formatted and
+# written by a background thread, so stream I/O never blocks the event loop
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 )
+_log_listener = QueueListener(_log_queue, _stream_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_root_logger.addHandler(QueueHandler(_log_queue))
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+# Demo banner, assembled once at import instead of via repeated string
+# concatenation on every run
+_BANNER = (
+    "╔" + "=" * 68 + "╗",
+    "║" + " " * 15 + "HEALTHCARE ADMINISTRATIVE ASSISTANT" + " " * 17 + "║",
+    "║" + " " * 22 + "Multi-Agent System Demo" + " " * 23 + "║",
+    "╚" + "=" * 68 + "╝",
+)
+
+@dataclass(slots=True, frozen=True)
+class DemoRequest:
+    """Base class for the typed demo request payloads below.
+
+    Agents consume plain dict requests, so to_request() converts at the call
+    boundary. Frozen slots instances keep the fixtures immutable, cheaper than
+    dicts, and catch field typos at construction instead of deep in an agent.
+    """
+    request_id: str
+
+    def to_request(self) -> Dict[str, Any]:
+        return asdict(self)
+
+@dataclass(slots=True, frozen=True)
+class IntakeRequest(DemoRequest):
+    patient_info: Dict[str, Any]
+
+@dataclass(slots=True, frozen=True)
+class AvailabilityRequest(DemoRequest):
+    preferred_date: str
+    patient_id: Optional[str] = None
+    appointment_type: str = "checkup"
+    duration_minutes: int = 30
+    appointment_action: str = "check_availability"
+
+@dataclass(slots=True, frozen=True)
+class BookingRequest(DemoRequest):
+    patient_id: str
+    preferred_date: str
+    preferred_provider: str
+    appointment_type: str = "checkup"
+    appointment_action: str = "book"
+
+@dataclass(slots=True, frozen=True)
+class VerificationRequest(DemoRequest):
+    patient_id: str
+    insurance_provider: str
+    insurance_id: str
+
+@dataclass(slots=True, frozen=True)
+class ReminderRequest(DemoRequest):
+    appointment_id: str
+    appointment_datetime: str
+    patient_email: str
+    patient_phone: str
+    provider_name: str
+    location: str
+    followup_action: str = "schedule_reminder"
+
+@dataclass(slots=True, frozen=True)
+class RescheduleRequest(DemoRequest):
+    appointment_id: str
+    new_date: str
+    reason: str
+    appointment_action: str = "reschedule"
+
+@dataclass(slots=True, frozen=True)
+class CancelRemindersRequest(DemoRequest):
+    appointment_id: str
+    followup_action: str = "cancel_reminders"
+
+@dataclass(slots=True, frozen=True)
+class NoShowRequest(DemoRequest):
+    appointment_id: str
+    patient_id: str
+    patient_email: str
+    patient_phone: str
+    followup_action: str = "process_no_show"
+
 class HealthcareAgentSystem:
     """Complete Healthcare Administrative Assistant System"""
     
     def __init__(self):
+        # Agent modules are imported here rather than at module top so CLI
+        # invocations that never build the system (e.g. --help) skip the
+        # whole agent import graph, trimming cold-start
+        from src.agents.orchestrator import OrchestratorAgent
+        from src.agents.intake_agent import IntakeAgent
+        from src.agents.scheduling_agent import SchedulingAgent
+        from src.agents.verification_agent import VerificationAgent
+        from src.agents.followup_agent import FollowupAgent
+
         self.orchestrator = OrchestratorAgent()
         self.intake_agent = IntakeAgent()
         self.scheduling_agent = SchedulingAgent()
         self.verification_agent = VerificationAgent()
         self.followup_agent = FollowupAgent()
-        
+
+        # Register sub-agents so the orchestrator can route to them
+        self.orchestrator.sub_agents = {
+            "intake": self.intake_agent,
+            "scheduling": self.scheduling_agent,
+            "verification": self.verification_agent,
+            "followup": self.followup_agent
+        }
+
         logger.info("✓ Healthcare Agent System initialized with all agents")
     
     async def process_new_patient_workflow(self):
@@ -48,9 +157,9 @@ class HealthcareAgentSystem:
         # Step 1: Intake
         logger.info("\n[STEP 1] INTAKE AGENT - Process Patient Information")
         logger.info("-" * 70)
-        intake_request = {
-            "request_id": "DEMO_001",
-            "patient_info": {
+        intake_request = IntakeRequest(
+            request_id="DEMO_001",
+            patient_info={
                 "first_name": "John",
                 "last_name": "Doe",
                 "email": "john.doe@example.com",
@@ -68,90 +177,84 @@ class HealthcareAgentSystem:
                 "insurance_id": "BSC123456",
                 "insurance_group_number": "GRP789"
             }
-        }
-        
-        intake_response = await self.intake_agent.process(intake_request)
-        logger.info(f"✓ Intake Response: Patient {intake_response['patient_name']} registered")
-        logger.info(f"  Patient ID: {intake_response['patient_id']}")
-        logger.info(f"  Critical Info: {intake_response['critical_info']['critical_flags']}")
+        )
+
+        intake_response = await self.intake_agent.process(intake_request.to_request())
+        logger.info("✓ Intake Response: Patient %s registered", intake_response['patient_name'])
+        logger.info("  Patient ID: %s", intake_response['patient_id'])
+        logger.info("  Critical Info: %s", intake_response['critical_info']['critical_flags'])
         
         patient_id = intake_response['patient_id']
-        
-        # Step 2: Check Availability
-        logger.info("\n[STEP 2] SCHEDULING AGENT - Check Availability")
+
+        # Step 2: Check Availability + Verify Insurance (parallel)
+        # Both depend only on the intake result, so they run concurrently
+        logger.info("\n[STEP 2] SCHEDULING + VERIFICATION AGENTS - Availability & Insurance (parallel)")
         logger.info("-" * 70)
         tomorrow = (datetime.now() + timedelta(days=1)).isoformat()
-        
-        availability_request = {
-            "request_id": "DEMO_001",
-            "patient_id": patient_id,
-            "appointment_action": "check_availability",
-            "preferred_date": tomorrow,
-            "appointment_type": "checkup",
-            "duration_minutes": 30
-        }
-        
-        availability_response = await self.scheduling_agent.process(availability_request)
-        logger.info(f"✓ Found {availability_response['total_slots']} available slots")
+
+        availability_request = AvailabilityRequest(
+            request_id="DEMO_001",
+            patient_id=patient_id,
+            preferred_date=tomorrow
+        )
+        verification_request = VerificationRequest(
+            request_id="DEMO_001",
+            patient_id=patient_id,
+            insurance_provider="Blue Shield",
+            insurance_id="BSC123456"
+        )
+
+        availability_response, verification_response = await asyncio.gather(
+            self.scheduling_agent.process(availability_request.to_request()),
+            self.verification_agent.process(verification_request.to_request())
+        )
+
+        logger.info("✓ Found %s available slots", availability_response['total_slots'])
         for i, slot in enumerate(availability_response['available_slots'][:2]):
-            logger.info(f"  Slot {i+1}: {slot['start_time']} - {slot['provider_name']}")
-        
+            logger.info("  Slot %s: %s - %s", i + 1, slot['start_time'], slot['provider_name'])
+
+        if verification_response['success']:
+            logger.info("✓ Insurance Verified: %s", verification_response['coverage_status'])
+            logger.info("  Copay: $%s", verification_response['copay'])
+            logger.info("  Estimated Cost: $%s", verification_response['estimated_appointment_cost'])
+        else:
+            logger.warning("✗ Insurance Verification Failed: %s", verification_response['error'])
+
         # Step 3: Book Appointment
         logger.info("\n[STEP 3] SCHEDULING AGENT - Book Appointment")
         logger.info("-" * 70)
-        booking_request = {
-            "request_id": "DEMO_001",
-            "patient_id": patient_id,
-            "appointment_action": "book",
-            "appointment_type": "checkup",
-            "preferred_date": availability_response['available_slots'][0]['start_time'],
-            "preferred_provider": "PROV_001"
-        }
-        
-        booking_response = await self.scheduling_agent.process(booking_request)
-        logger.info(f"✓ Appointment Booked: {booking_response['appointment_id']}")
-        logger.info(f"  Date/Time: {booking_response['appointment_datetime']}")
-        logger.info(f"  Provider: {booking_response['provider_name']}")
-        logger.info(f"  Location: {booking_response['location']}")
-        
+        booking_request = BookingRequest(
+            request_id="DEMO_001",
+            patient_id=patient_id,
+            preferred_date=availability_response['available_slots'][0]['start_time'],
+            preferred_provider="PROV_001"
+        )
+
+        booking_response = await self.scheduling_agent.process(booking_request.to_request())
+        logger.info("✓ Appointment Booked: %s", booking_response['appointment_id'])
+        logger.info("  Date/Time: %s", booking_response['appointment_datetime'])
+        logger.info("  Provider: %s", booking_response['provider_name'])
+        logger.info("  Location: %s", booking_response['location'])
+
         appointment_id = booking_response['appointment_id']
-        
-        # Step 4: Verify Insurance
-        logger.info("\n[STEP 4] VERIFICATION AGENT - Insurance Verification")
-        logger.info("-" * 70)
-        verification_request = {
-            "request_id": "DEMO_001",
-            "patient_id": patient_id,
-            "insurance_provider": "Blue Shield",
-            "insurance_id": "BSC123456"
-        }
-        
-        verification_response = await self.verification_agent.process(verification_request)
-        if verification_response['success']:
-            logger.info(f"✓ Insurance Verified: {verification_response['coverage_status']}")
-            logger.info(f"  Copay: ${verification_response['copay']}")
-            logger.info(f"  Estimated Cost: ${verification_response['estimated_appointment_cost']}")
-        else:
-            logger.warning(f"✗ Insurance Verification Failed: {verification_response['error']}")
-        
-        # Step 5: Schedule Reminders
-        logger.info("\n[STEP 5] FOLLOWUP AGENT - Schedule Reminders")
+
+        # Step 4: Schedule Reminders
+        logger.info("\n[STEP 4] FOLLOWUP AGENT - Schedule Reminders")
         logger.info("-" * 70)
-        reminder_request = {
-            "request_id": "DEMO_001",
-            "appointment_id": appointment_id,
-            "followup_action": "schedule_reminder",
-            "appointment_datetime": booking_response['appointment_datetime'],
-            "patient_email": "john.doe@example.com",
-            "patient_phone": "+12125551234",
-            "provider_name": booking_response['provider_name'],
-            "location": booking_response['location']
-        }
-        
-        reminder_response = await self.followup_agent.process(reminder_request)
-        logger.info(f"✓ Reminders Scheduled: {reminder_response['reminders_scheduled']}")
-        for reminder in reminder_response['reminders']:
-            logger.info(f"  - {reminder['type']}: {reminder['scheduled_time']}")
+        reminder_request = ReminderRequest(
+            request_id="DEMO_001",
+            appointment_id=appointment_id,
+            appointment_datetime=booking_response['appointment_datetime'],
+            patient_email="john.doe@example.com",
+            patient_phone="+12125551234",
+            provider_name=booking_response['provider_name'],
+            location=booking_response['location']
+        )
+
+        reminder_response = await self.followup_agent.process(reminder_request.to_request())
+        logger.info("✓ Reminders Scheduled: %s", reminder_response['reminders_scheduled'])
+        for reminder in reminder_response['reminder_summary']:
+            logger.info("  - %s: %s", reminder['type'], reminder['scheduled_time'])
         
         logger.info("\n" + "="*70)
         logger.info("✓ NEW PATIENT WORKFLOW COMPLETE")
@@ -169,63 +272,59 @@ class HealthcareAgentSystem:
         logger.info("WORKFLOW 2: RESCHEDULE APPOINTMENT")
         logger.info("="*70)
         
-        # Step 1: Check new availability
-        logger.info("\n[STEP 1] SCHEDULING AGENT - Check New Availability")
+        # Step 1: Check new availability + cancel old reminders (parallel)
+        # The two are independent, so they run concurrently
+        logger.info("\n[STEP 1] SCHEDULING + FOLLOWUP AGENTS - Availability & Cancel Reminders (parallel)")
         logger.info("-" * 70)
         new_date = (datetime.now() + timedelta(days=3)).isoformat()
-        
-        availability_request = {
-            "request_id": "DEMO_002",
-            "appointment_action": "check_availability",
-            "preferred_date": new_date,
-            "appointment_type": "checkup"
-        }
-        
-        availability_response = await self.scheduling_agent.process(availability_request)
-        logger.info(f"✓ Found {availability_response['total_slots']} available slots")
-        
+
+        availability_request = AvailabilityRequest(
+            request_id="DEMO_002",
+            preferred_date=new_date
+        )
+        cancel_request = CancelRemindersRequest(
+            request_id="DEMO_002",
+            appointment_id=appointment_id
+        )
+
+        availability_response, cancel_response = await asyncio.gather(
+            self.scheduling_agent.process(availability_request.to_request()),
+            self.followup_agent.process(cancel_request.to_request())
+        )
+        logger.info("✓ Found %s available slots", availability_response['total_slots'])
+        logger.info("✓ Old Reminders Cancelled: %s", cancel_response['reminders_cancelled'])
+
         # Step 2: Reschedule
         logger.info("\n[STEP 2] SCHEDULING AGENT - Reschedule Appointment")
         logger.info("-" * 70)
-        reschedule_request = {
-            "request_id": "DEMO_002",
-            "appointment_id": appointment_id,
-            "appointment_action": "reschedule",
-            "new_date": availability_response['available_slots'][0]['start_time'],
-            "reason": "Schedule conflict"
-        }
-        
-        reschedule_response = await self.scheduling_agent.process(reschedule_request)
-        logger.info(f"✓ Appointment Rescheduled")
-        logger.info(f"  Old Date: {reschedule_response['old_datetime']}")
-        logger.info(f"  New Date: {reschedule_response['new_datetime']}")
-        
-        # Step 3: Cancel old reminders and schedule new ones
-        logger.info("\n[STEP 3] FOLLOWUP AGENT - Update Reminders")
+        reschedule_request = RescheduleRequest(
+            request_id="DEMO_002",
+            appointment_id=appointment_id,
+            new_date=availability_response['available_slots'][0]['start_time'],
+            reason="Schedule conflict"
+        )
+
+        reschedule_response = await self.scheduling_agent.process(reschedule_request.to_request())
+        logger.info("✓ Appointment Rescheduled")
+        logger.info("  Old Date: %s", reschedule_response['old_datetime'])
+        logger.info("  New Date: %s", reschedule_response['new_datetime'])
+
+        # Step 3: Schedule reminders for the new date
+        logger.info("\n[STEP 3] FOLLOWUP AGENT - Schedule New Reminders")
         logger.info("-" * 70)
-        
-        cancel_request = {
-            "request_id": "DEMO_002",
-            "appointment_id": appointment_id,
-            "followup_action": "cancel_reminders"
-        }
-        
-        cancel_response = await self.followup_agent.process(cancel_request)
-        logger.info(f"✓ Old Reminders Cancelled: {cancel_response['reminders_cancelled']}")
-        
-        schedule_request = {
-            "request_id": "DEMO_002",
-            "appointment_id": appointment_id,
-            "followup_action": "schedule_reminder",
-            "appointment_datetime": reschedule_response['new_datetime'],
-            "patient_email": "john.doe@example.com",
-            "patient_phone": "+12125551234",
-            "provider_name": "Dr. Jane Smith",
-            "location": "Downtown Clinic"
-        }
-        
-        schedule_response = await self.followup_agent.process(schedule_request)
-        logger.info(f"✓ New Reminders Scheduled: {schedule_response['reminders_scheduled']}")
+
+        schedule_request = ReminderRequest(
+            request_id="DEMO_002",
+            appointment_id=appointment_id,
+            appointment_datetime=reschedule_response['new_datetime'],
+            patient_email="john.doe@example.com",
+            patient_phone="+12125551234",
+            provider_name="Dr. Jane Smith",
+            location="Downtown Clinic"
+        )
+
+        schedule_response = await self.followup_agent.process(schedule_request.to_request())
+        logger.info("✓ New Reminders Scheduled: %s", schedule_response['reminders_scheduled'])
         
         logger.info("\n" + "="*70)
         logger.info("✓ RESCHEDULE WORKFLOW COMPLETE")
@@ -240,34 +339,43 @@ class HealthcareAgentSystem:
         logger.info("\n[STEP 1] FOLLOWUP AGENT - Process No-Show")
         logger.info("-" * 70)
         
-        no_show_request = {
-            "request_id": "DEMO_003",
-            "appointment_id": appointment_id,
-            "patient_id": patient_id,
-            "followup_action": "process_no_show",
-            "patient_email": "john.doe@example.com",
-            "patient_phone": "+12125551234"
-        }
-        
-        no_show_response = await self.followup_agent.process(no_show_request)
-        logger.info(f"✓ No-Show Recorded and Processed")
+        no_show_request = NoShowRequest(
+            request_id="DEMO_003",
+            appointment_id=appointment_id,
+            patient_id=patient_id,
+            patient_email="john.doe@example.com",
+            patient_phone="+12125551234"
+        )
+
+        no_show_response = await self.followup_agent.process(no_show_request.to_request())
+        logger.info("✓ No-Show Recorded and Processed")
         for action in no_show_response['actions_taken']:
-            logger.info(f"  ✓ {action}")
+            logger.info("  ✓ %s", action)
         
         logger.info("\n" + "="*70)
         logger.info("✓ NO-SHOW WORKFLOW COMPLETE")
         logger.info("="*70)
 
+@functools.cache
+def get_healthcare_system() -> "HealthcareAgentSystem":
+    """Return the process-wide HealthcareAgentSystem singleton.
+
+    Construction builds five agents, so server deployments (e.g. Cloud Run)
+    should route every request through this factory rather than constructing
+    a fresh system: warm workers then pay zero init cost per request. Agents
+    must stay stateless per request for this to hold — durable state such as
+    reminders belongs in Redis, not on the agent instance.
+    """
+    return HealthcareAgentSystem()
+
 async def main():
     """Main demo function"""
     logger.info("\n")
-    logger.info("╔" + "="*68 + "╗")
-    logger.info("║" + " "*15 + "HEALTHCARE ADMINISTRATIVE ASSISTANT" + " "*17 + "║")
-    logger.info("║" + " "*22 + "Multi-Agent System Demo" + " "*23 + "║")
-    logger.info("╚" + "="*68 + "╝")
+    for line in _BANNER:
+        logger.info(line)
     
-    # Initialize system
-    system = HealthcareAgentSystem()
+    # Initialize system (reused across invocations in the same process)
+    system = get_healthcare_system()
     
     # Run workflows
     try:
@@ -304,7 +412,9 @@ async def main():
         logger.info("  → Create web UI for patient/provider interactions")
     
     except Exception as e:
-        logger.error(f"Error running workflows: {str(e)}", exc_info=True)
+        logger.error("Error running workflows: %s", e, exc_info=True)
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(main())
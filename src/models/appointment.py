@@ -1,10 +1,11 @@
 """Appointment data model"""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional
 from uuid import uuid4
 from enum import Enum
+import time
 
 class AppointmentStatus(str, Enum):
     SCHEDULED = "scheduled"
@@ -40,11 +41,13 @@ class Appointment(BaseModel):
     reminder_1h_sent: bool = False
     insurance_verified: bool = False
     pre_visit_documents_sent: bool = False
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Audit stamps are epoch nanoseconds (one 8-byte int per field);
+    # consumers format them to ISO at the response boundary
+    created_at: int = Field(default_factory=time.time_ns)
+    updated_at: int = Field(default_factory=time.time_ns)
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "appointment_id": "apt_456",
                 "patient_id": "pat_123",
@@ -56,3 +59,4 @@ class Appointment(BaseModel):
                 "status": "scheduled"
             }
         }
+    )
@@ -1,6 +1,6 @@
 """Patient data model"""
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from datetime import datetime
 from typing import Optional, List
 from uuid import uuid4
@@ -27,8 +27,12 @@ class Patient(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        json_schema_extra = {
+    # Patient profiles are read-only once built: frozen drops the
+    # per-assignment validation hook and makes instances hashable for
+    # set/dict membership
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "patient_id": "pat_123",
                 "first_name": "John",
@@ -40,6 +44,7 @@ class Patient(BaseModel):
                 "insurance_id": "BSC123456"
             }
         }
+    )
 
     def full_name(self) -> str:
         """Return full name"""
@@ -1,5 +1,7 @@
 """Tools for agent use"""
 
+from .notifications import NotificationTools
+
 __all__ = [
     "CalendarTools",
     "EHRTools",
@@ -0,0 +1,85 @@
+"""Notification tools - outbound SMS and email transport"""
+
+import logging
+import os
+from typing import Any, Dict, Optional
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; sends fall back to mock delivery
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+class NotificationTools:
+    """
+    Shared transport for outbound patient notifications (SMS, email).
+
+    All sends go through a single aiohttp.ClientSession backed by a pooled
+    TCPConnector, so concurrent reminder fan-out reuses warm TCP/TLS
+    connections to the SMS/email gateways instead of paying a handshake per
+    message. The session is created lazily on first send (it must be built
+    inside a running event loop) and shared for the life of the process.
+
+    Gateway endpoints come from EMAIL_GATEWAY_URL / SMS_GATEWAY_URL. When
+    aiohttp is unavailable or no gateway is configured, sends are mocked as
+    queued so the demo stays self-contained.
+    """
+
+    def __init__(self):
+        self._session = None
+        self.email_gateway_url = os.getenv("EMAIL_GATEWAY_URL")
+        self.sms_gateway_url = os.getenv("SMS_GATEWAY_URL")
+
+    async def _ensure_session(self):
+        """Create the shared pooled session on first use"""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30
+                )
+            )
+        return self._session
+
+    async def send_email(self, to: str, subject: str, body: str) -> Dict[str, Any]:
+        """Send an email notification through the pooled session"""
+        return await self._send(
+            self.email_gateway_url,
+            {"to": to, "subject": subject, "body": body},
+            channel="email"
+        )
+
+    async def send_sms(self, to: str, body: str) -> Dict[str, Any]:
+        """Send an SMS notification through the pooled session"""
+        return await self._send(
+            self.sms_gateway_url,
+            {"to": to, "body": body},
+            channel="sms"
+        )
+
+    async def _send(self, gateway_url: Optional[str], payload: Dict[str, Any], channel: str) -> Dict[str, Any]:
+        """POST a notification payload to its gateway, or mock-queue it"""
+        if aiohttp is None or not gateway_url:
+            logger.info("No %s gateway configured, queueing mock delivery", channel)
+            return {
+                "success": True,
+                "channel": channel,
+                "delivery_status": "queued"
+            }
+
+        session = await self._ensure_session()
+        async with session.post(gateway_url, json=payload) as response:
+            return {
+                "success": response.status < 400,
+                "channel": channel,
+                "delivery_status": "sent" if response.status < 400 else "failed",
+                "gateway_status": response.status
+            }
+
+    async def close(self) -> None:
+        """Close the shared session and its connection pool"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None